@@ -6,7 +6,8 @@ Demonstrates integrating the Tiqiaa library into an automation script.
 """
 
 import time
-from tiqiaa import TiqiaaIR, load_ir_code, list_ir_codes
+from tiqiaa import TiqiaaIR, load_ir_code, list_ir_codes, get_freq_index
+from tiqiaa.protocol import STATE_SEND
 
 def send_code_by_name(ir: TiqiaaIR, name: str, repeat: int = 1) -> bool:
     """Send a saved IR code by name with optional repeat."""
@@ -15,8 +16,14 @@ def send_code_by_name(ir: TiqiaaIR, name: str, repeat: int = 1) -> bool:
         print(f"Code '{name}' not found")
         return False
 
+    # Switch mode and resolve the frequency once, not per repeat
+    if ir.device_state != STATE_SEND and not ir.set_mode('send'):
+        print("Failed to set send mode")
+        return False
+    freq_id = get_freq_index(freq)
+
     for i in range(repeat):
-        ir.send_ir(ir_data, freq)
+        ir.send_ir_prepared(ir_data, freq_id)
         if repeat > 1:
             time.sleep(0.1)
 
@@ -96,11 +103,8 @@ def main():
 
             if choice == '1':
                 name = input("Code name: ").strip()
-                if name in list_ir_codes():
-                    send_code_by_name(ir, name)
+                if send_code_by_name(ir, name):
                     print("Sent!")
-                else:
-                    print(f"Code '{name}' not found")
 
             elif choice == '2':
                 tv_power_sequence(ir)
@@ -37,8 +37,8 @@ __version__ = "1.0.0"
 __author__ = "Tiqiaa Python Library Contributors"
 __credits__ = "Based on protocol work from https://gitlab.com/XenRE/tiqiaa-usb-ir"
 
-# Core device driver
-from .device import TiqiaaIR
+import importlib
+from typing import TYPE_CHECKING
 
 # Protocol constants
 from .protocol import (
@@ -50,27 +50,61 @@ from .protocol import (
     get_freq_by_index,
 )
 
-# NEC protocol utilities
-from .nec import (
-    encode_nec,
-    encode_nec_extended,
-    encode_nec_repeat,
-    decode_nec,
-    format_nec_code,
-)
-
 # Storage utilities
 from .storage import (
     save_ir_code,
     load_ir_code,
     load_ir_code_full,
     load_smart_code,
+    load_smart_code_cached,
     list_ir_codes,
+    iter_ir_codes,
     delete_ir_code,
     export_codes,
     import_codes,
 )
 
+# The device driver (pyusb) and NEC utilities (NumPy/Numba when installed)
+# are imported on first access, so code that only needs storage - such as
+# the CLI's list command - does not pay for loading them
+_LAZY_ATTRS = {
+    # Core device driver
+    "TiqiaaIR": ".device",
+
+    # NEC protocol utilities
+    "encode_nec": ".nec",
+    "encode_nec_extended": ".nec",
+    "encode_nec_repeat": ".nec",
+    "precompute_common": ".nec",
+    "decode_nec": ".nec",
+    "format_nec_code": ".nec",
+}
+
+if TYPE_CHECKING:
+    from .device import TiqiaaIR
+    from .nec import (
+        encode_nec,
+        encode_nec_extended,
+        encode_nec_repeat,
+        precompute_common,
+        decode_nec,
+        format_nec_code,
+    )
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
 __all__ = [
     # Version
     "__version__",
@@ -90,6 +124,7 @@ __all__ = [
     "encode_nec",
     "encode_nec_extended",
     "encode_nec_repeat",
+    "precompute_common",
     "decode_nec",
     "format_nec_code",
 
@@ -98,7 +133,9 @@ __all__ = [
     "load_ir_code",
     "load_ir_code_full",
     "load_smart_code",
+    "load_smart_code_cached",
     "list_ir_codes",
+    "iter_ir_codes",
     "delete_ir_code",
     "export_codes",
     "import_codes",
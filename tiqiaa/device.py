@@ -15,9 +15,12 @@ Requirements:
 import usb.core
 import usb.util
 import struct
+from array import array
 import time
 import threading
-from typing import Optional, Callable
+from collections import deque
+from concurrent.futures import Future
+from typing import Optional, Callable, Dict, Tuple
 
 try:
     import libusb_package
@@ -27,14 +30,21 @@ except ImportError:
 
 from .protocol import (
     VID, PID, EP_OUT, EP_IN,
-    PACK_START, PACK_END, MAX_FRAG_SIZE,
+    PACK_START, PACK_END, MAX_FRAG_SIZE, REPORT_SIZE,
     CMD_VERSION, CMD_IDLE_MODE, CMD_SEND_MODE, CMD_RECV_MODE,
     CMD_DATA, CMD_OUTPUT, CMD_CANCEL,
     STATE_IDLE, STATE_SEND, STATE_RECV,
-    IR_FREQ_TABLE, get_freq_index
+    IR_FREQ_TABLE, _FREQ_INDEX
 )
 from .nec import encode_nec
 
+# Precompiled packet layouts
+_CMD_PACKET = struct.Struct('<HBBH')       # start, cmd_id, cmd_type, end
+_DATA_HEADER = struct.Struct('<HBBB')      # start, cmd_id, CMD_DATA, freq_id
+_U16 = struct.Struct('<H')                 # packet start/end markers
+_REPORT = struct.Struct(f'<5B{MAX_FRAG_SIZE}s')  # report header + zero-padded payload
+_END_BYTES = _U16.pack(PACK_END)
+
 
 class TiqiaaIR:
     """
@@ -59,11 +69,22 @@ class TiqiaaIR:
         self.packet_idx = 0
         self.cmd_id = 0
         self.device_state = 0
-        self.read_thread = None
-        self.read_active = False
-        self.received_packets = []
+        # Unsolicited packets; deque append/popleft are atomic, so no lock
+        self.received_packets = deque()
         self.packet_event = threading.Event()
-        self.lock = threading.Lock()
+        self.lock = threading.Lock()  # guards _pending
+
+        # Replies awaited by (cmd_id, cmd_type), resolved by whichever
+        # thread is reading from the device
+        self._pending: Dict[Tuple[int, int], Future] = {}
+
+        # Serialises reads and packet reassembly between waiting threads
+        self._rx_lock = threading.Lock()
+
+        # Reusable USB reports, one per fragment (guarded by _tx_lock).
+        # pyusb hands array('B') buffers to libusb without copying them.
+        self._tx_reports = []
+        self._tx_lock = threading.Lock()
 
         # For packet reassembly
         self._recv_buffer = bytearray()
@@ -123,26 +144,22 @@ class TiqiaaIR:
         except:
             pass
 
-        # Drain pending data
+        # Drain pending data until the endpoint is empty
         for _ in range(10):
             try:
                 self.dev.read(EP_IN, 64, timeout=50)
-            except:
+            except usb.core.USBTimeoutError:
+                break
+            except usb.core.USBError:
                 pass
 
-        # Start background read thread
-        self.read_active = True
-        self.read_thread = threading.Thread(target=self._read_thread, daemon=True)
-        self.read_thread.start()
-
-        time.sleep(0.2)
-
-        # Initialize to send mode
+        # Initialize to send mode, returning as soon as the device replies
         for attempt in range(3):
             try:
-                self._send_cmd(CMD_SEND_MODE)
-                time.sleep(0.2)
-                self.device_state = STATE_SEND
+                if not self._send_cmd_wait(CMD_SEND_MODE, timeout=0.5):
+                    # Command went out but was not acknowledged; assume
+                    # the device switched anyway
+                    self.device_state = STATE_SEND
                 if verbose:
                     print("Device opened successfully!")
                 return True
@@ -162,7 +179,6 @@ class TiqiaaIR:
     def close(self):
         """Close the device connection and release resources."""
         if self.dev:
-            self.read_active = False
             try:
                 self._send_cmd(CMD_IDLE_MODE)
             except:
@@ -182,13 +198,22 @@ class TiqiaaIR:
         """
         return self.dev is not None
 
-    def send_ir(self, ir_data: bytes, freq: int = 38000) -> bool:
+    def send_ir(
+        self,
+        ir_data: bytes,
+        freq: int = 38000,
+        repeat: int = 1,
+        interval: float = 0.1
+    ) -> bool:
         """
         Send raw IR signal data.
 
         Args:
             ir_data: Raw IR signal bytes (timing data)
             freq: Carrier frequency in Hz (default 38000)
+            repeat: Number of times to send the signal
+            interval: Seconds from the start of one send to the start of
+                the next when repeating
 
         Returns:
             True if sent successfully
@@ -202,39 +227,110 @@ class TiqiaaIR:
             if not self._send_cmd_wait(CMD_SEND_MODE):
                 return False
 
-        freq_id = get_freq_index(freq)
+        freq_id = _FREQ_INDEX.get(freq, 0)
+        if repeat <= 1:
+            return self.send_ir_prepared(ir_data, freq_id)
+
+        # Pace repeats against a monotonic schedule so send time and
+        # sleep overshoot do not accumulate over the batch
+        next_send = time.monotonic()
+        for i in range(repeat):
+            if i:
+                delay = next_send - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            self.send_ir_prepared(ir_data, freq_id)
+            next_send += interval
+
+        return True
+
+    def send_ir_prepared(self, ir_data: bytes, freq_id: int) -> bool:
+        """
+        Send raw IR signal data without mode or frequency handling.
+
+        Fast path for repeated sends: the caller switches the device to
+        send mode once (see set_mode) and resolves the frequency index
+        once (see get_freq_index).
+
+        Args:
+            ir_data: Raw IR signal bytes (timing data)
+            freq_id: Index into IR_FREQ_TABLE
+
+        Returns:
+            True if sent successfully
+
+        Example:
+            >>> freq_id = get_freq_index(38000)
+            >>> for _ in range(10):
+            ...     ir.send_ir_prepared(ir_data, freq_id)
+        """
         cmd_id = self._get_cmd_id()
 
         # Build IR packet
-        packet = struct.pack('<HBB', PACK_START, cmd_id, CMD_DATA)
-        packet += bytes([freq_id])
-        packet += ir_data
-        packet += struct.pack('<H', PACK_END)
+        packet = b''.join((
+            _DATA_HEADER.pack(PACK_START, cmd_id, CMD_DATA, freq_id),
+            ir_data,
+            _END_BYTES,
+        ))
 
-        with self.lock:
-            self.received_packets.clear()
-            self.packet_event.clear()
+        return self._send_data_packet(cmd_id, packet)
 
-        self._send_report(packet)
+    @staticmethod
+    def encode_ir(ir_data: bytes, freq: int = 38000) -> bytearray:
+        """
+        Build a reusable IR data packet for send_raw.
 
-        # Wait for completion acknowledgment
-        start = time.time()
-        while time.time() - start < 2.0:
-            if self.packet_event.wait(timeout=0.1):
-                with self.lock:
-                    for pkt in self.received_packets:
-                        if len(pkt) >= 2 and pkt[0] == cmd_id and pkt[1] == CMD_OUTPUT:
-                            return True
-                    self.packet_event.clear()
+        The packet is serialized once; send_raw only patches in the
+        command ID, so repeated sends of the same code skip rebuilding it.
 
-        return True  # Assume sent even without confirmation
+        Args:
+            ir_data: Raw IR signal bytes (timing data)
+            freq: Carrier frequency in Hz (default 38000)
+
+        Returns:
+            Encoded packet
+
+        Example:
+            >>> packet = TiqiaaIR.encode_ir(ir_data, 38000)
+            >>> for _ in range(10):
+            ...     ir.send_raw(packet)
+        """
+        return bytearray(b''.join((
+            _DATA_HEADER.pack(PACK_START, 0, CMD_DATA, _FREQ_INDEX.get(freq, 0)),
+            ir_data,
+            _END_BYTES,
+        )))
+
+    def send_raw(self, packet: bytearray) -> bool:
+        """
+        Send an IR data packet built by encode_ir.
+
+        The packet is updated in place with a new command ID, so it must
+        not be sent from several threads at once.
+
+        Args:
+            packet: Packet returned by encode_ir
 
-    def send_nec(self, code: int) -> bool:
+        Returns:
+            True if sent successfully
+        """
+        if self.device_state != STATE_SEND:
+            if not self._send_cmd_wait(CMD_SEND_MODE):
+                return False
+
+        cmd_id = self._get_cmd_id()
+        packet[2] = cmd_id  # follows the 2-byte start marker
+
+        return self._send_data_packet(cmd_id, packet)
+
+    def send_nec(self, code: int, repeat: int = 1, interval: float = 0.1) -> bool:
         """
         Send a NEC protocol code.
 
         Args:
             code: 16-bit NEC code (high byte=address, low byte=command)
+            repeat: Number of times to send the code
+            interval: Seconds between the starts of repeated sends
 
         Returns:
             True if sent successfully
@@ -243,13 +339,14 @@ class TiqiaaIR:
             >>> ir.send_nec(0x00FF)  # Address 0x00, Command 0xFF
         """
         ir_data = encode_nec(code)
-        return self.send_ir(ir_data, 38000)
+        return self.send_ir(ir_data, 38000, repeat=repeat, interval=interval)
 
     def receive_ir(
         self,
         timeout_sec: int = 15,
         callback: Optional[Callable[[bytes], None]] = None,
-        verbose: bool = True
+        verbose: bool = True,
+        cancel: Optional[threading.Event] = None
     ) -> Optional[bytes]:
         """
         Receive/learn an IR signal.
@@ -260,9 +357,11 @@ class TiqiaaIR:
             timeout_sec: Maximum time to wait in seconds
             callback: Optional callback called when signal received
             verbose: Print status messages
+            cancel: Optional event; setting it from another thread ends
+                the wait early (within about 100 ms)
 
         Returns:
-            Raw IR signal data, or None if timeout/error
+            Raw IR signal data, or None if timeout/error/cancelled
 
         Example:
             >>> data = ir.receive_ir(timeout_sec=10)
@@ -279,9 +378,8 @@ class TiqiaaIR:
         self._send_cmd_wait(CMD_CANCEL)
 
         # Clear received data
-        with self.lock:
-            self.received_packets.clear()
-            self.packet_event.clear()
+        self.received_packets.clear()
+        self.packet_event.clear()
 
         # Start receiving
         self._send_cmd(CMD_OUTPUT)
@@ -291,19 +389,31 @@ class TiqiaaIR:
             print("Press a button on your remote, pointed at the receiver.")
 
         # Wait for IR data
-        start = time.time()
-        while time.time() - start < timeout_sec:
-            if self.packet_event.wait(timeout=0.5):
-                with self.lock:
-                    for pkt in self.received_packets:
-                        if len(pkt) >= 2 and pkt[1] == CMD_DATA:
-                            ir_data = pkt[2:]
-                            if verbose:
-                                print(f"\nReceived {len(ir_data)} bytes of IR data!")
-                            if callback:
-                                callback(ir_data)
-                            return ir_data
-                    self.packet_event.clear()
+        if cancel is None:
+            done = self.packet_event.is_set
+        else:
+            def done():
+                return self.packet_event.is_set() or cancel.is_set()
+
+        deadline = time.monotonic() + timeout_sec
+        while True:
+            self._read_until(done, deadline)
+            if not self.packet_event.is_set():
+                break
+
+            self.packet_event.clear()
+            while self.received_packets:
+                pkt = self.received_packets.popleft()
+                if len(pkt) >= 2 and pkt[1] == CMD_DATA:
+                    ir_data = pkt[2:]
+                    if verbose:
+                        print(f"\nReceived {len(ir_data)} bytes of IR data!")
+                    if callback:
+                        callback(ir_data)
+                    return ir_data
+
+        if cancel is not None and cancel.is_set():
+            return None
 
         if verbose:
             print("\nTimeout - no IR signal received")
@@ -346,42 +456,60 @@ class TiqiaaIR:
         """
         Send data with fragmentation via USB Report ID 2.
 
-        Large packets are split into 56-byte fragments.
+        Large packets are split into 56-byte fragments. All fragments are
+        staged into preallocated array('B') reports first, so the USB writes
+        go out back-to-back without packing work in between, and pyusb sends
+        each report as-is instead of converting it. A single pack_into fills
+        the header, payload and zero padding of each report.
         """
-        packet_idx = self._get_packet_idx()
-        frag_count = (len(data) + MAX_FRAG_SIZE - 1) // MAX_FRAG_SIZE
+        with self._tx_lock:
+            packet_idx = self._get_packet_idx()
+            frag_count = (len(data) + MAX_FRAG_SIZE - 1) // MAX_FRAG_SIZE
 
-        offset = 0
-        frag_idx = 0
-        while offset < len(data):
-            frag_idx += 1
-            chunk = data[offset:offset + MAX_FRAG_SIZE]
-            frag_size = len(chunk) + 3
+            reports = self._tx_reports
+            while len(reports) < frag_count:
+                reports.append(array('B', bytes(REPORT_SIZE)))
 
-            # Report format: [ReportID, FragSize, PacketIdx, FragCount, FragIdx, Data...]
-            report = bytes([0x02, frag_size, packet_idx, frag_count, frag_idx]) + chunk
-            report = report.ljust(61, b'\x00')
+            for frag_idx in range(1, frag_count + 1):
+                offset = (frag_idx - 1) * MAX_FRAG_SIZE
+                chunk = data[offset:offset + MAX_FRAG_SIZE]
 
-            for attempt in range(5):
-                try:
-                    self.dev.write(EP_OUT, report, timeout=2000)
-                    break
-                except usb.core.USBTimeoutError:
-                    if attempt == 4:
-                        raise
-                    time.sleep(0.1)
-                except usb.core.USBError:
-                    if attempt == 4:
-                        raise
-                    time.sleep(0.1)
+                # Report format: [ReportID, FragSize, PacketIdx, FragCount, FragIdx, Data...]
+                _REPORT.pack_into(reports[frag_idx - 1], 0, 0x02, len(chunk) + 3,
+                                  packet_idx, frag_count, frag_idx, chunk)
+
+            for frag_idx in range(frag_count):
+                self._write_report(reports[frag_idx])
+
+    def _write_report(self, report):
+        """Write a single USB report, retrying on transient errors."""
+        for attempt in range(5):
+            try:
+                self.dev.write(EP_OUT, report, timeout=2000)
+                return
+            except usb.core.USBTimeoutError:
+                if attempt == 4:
+                    raise
+                time.sleep(0.1)
+            except usb.core.USBError:
+                if attempt == 4:
+                    raise
+                time.sleep(0.1)
+
+    def _send_data_packet(self, cmd_id: int, packet) -> bool:
+        """Send an IR data packet and wait for its output acknowledgment."""
+        self.received_packets.clear()
+        self.packet_event.clear()
 
-            offset += MAX_FRAG_SIZE
+        # Wait for completion acknowledgment
+        self._wait_reply(cmd_id, CMD_OUTPUT, packet, timeout=2.0)
+        return True  # Assume sent even without confirmation
 
     def _send_cmd(self, cmd_type: int, cmd_id: Optional[int] = None) -> int:
         """Send a command packet."""
         if cmd_id is None:
             cmd_id = self._get_cmd_id()
-        packet = struct.pack('<HBBH', PACK_START, cmd_id, cmd_type, PACK_END)
+        packet = _CMD_PACKET.pack(PACK_START, cmd_id, cmd_type, PACK_END)
         self._send_report(packet)
         return cmd_id
 
@@ -389,39 +517,76 @@ class TiqiaaIR:
         """Send command and wait for reply."""
         cmd_id = self._get_cmd_id()
 
+        self.received_packets.clear()
+        self.packet_event.clear()
+
+        packet = _CMD_PACKET.pack(PACK_START, cmd_id, cmd_type, PACK_END)
+        pkt = self._wait_reply(cmd_id, cmd_type, packet, timeout)
+        if pkt is None:
+            return False
+
+        if len(pkt) >= 3:
+            self.device_state = pkt[2]
+        return True
+
+    def _wait_reply(
+        self,
+        cmd_id: int,
+        cmd_type: int,
+        packet: bytes,
+        timeout: float
+    ) -> Optional[bytes]:
+        """
+        Send a packet and wait for the reply matching (cmd_id, cmd_type).
+
+        The reply future is registered before sending so a fast reply
+        cannot be missed. Returns the reply packet, or None on timeout.
+        """
+        key = (cmd_id, cmd_type)
+        future: Future = Future()
         with self.lock:
-            self.received_packets.clear()
-            self.packet_event.clear()
+            self._pending[key] = future
 
-        self._send_cmd(cmd_type, cmd_id)
-
-        start = time.time()
-        while time.time() - start < timeout:
-            if self.packet_event.wait(timeout=0.1):
-                with self.lock:
-                    for pkt in self.received_packets:
-                        if len(pkt) >= 2 and pkt[0] == cmd_id and pkt[1] == cmd_type:
-                            if len(pkt) >= 3:
-                                self.device_state = pkt[2]
-                            return True
-                    self.packet_event.clear()
-        return False
+        try:
+            self._send_report(packet)
+            self._read_until(future.done, time.monotonic() + timeout)
+            return future.result() if future.done() else None
+        finally:
+            with self.lock:
+                self._pending.pop(key, None)
+
+    def _read_until(self, done: Callable[[], bool], deadline: float):
+        """
+        Read from the device until done() returns True or the deadline passes.
 
-    def _read_thread(self):
-        """Background thread to read from device."""
-        while self.read_active:
-            try:
-                data = self.dev.read(EP_IN, 64, timeout=100)
-                if data:
-                    self._process_recv_data(bytes(data))
-            except usb.core.USBTimeoutError:
-                pass
-            except usb.core.USBError:
-                if self.read_active:
+        Reads only happen while an operation is waiting for data. Several
+        threads may wait at once; they take turns reading, and every packet
+        is dispatched to whichever waiter it belongs to.
+        """
+        while not done():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+
+            with self._rx_lock:
+                if done():
+                    return
+                try:
+                    data = self.dev.read(EP_IN, 64, timeout=max(1, int(min(remaining, 0.1) * 1000)))
+                    if data:
+                        self._process_recv_data(memoryview(data))
+                except usb.core.USBTimeoutError:
+                    pass
+                except usb.core.USBError:
                     time.sleep(0.1)
 
-    def _process_recv_data(self, data: bytes):
-        """Process received USB data and reassemble fragmented packets."""
+    def _process_recv_data(self, data: memoryview):
+        """
+        Process received USB data and reassemble fragmented packets.
+
+        Takes the report as a memoryview, so payloads are copied straight
+        into the reassembly buffer without intermediate slices.
+        """
         if len(data) < 5:
             return
 
@@ -455,12 +620,19 @@ class TiqiaaIR:
         # Check if packet complete
         if self._recv_frag_count > 0 and self._recv_last_frag == self._recv_frag_count:
             if len(self._recv_buffer) >= 4:
-                start_sig = struct.unpack('<H', self._recv_buffer[0:2])[0]
-                end_sig = struct.unpack('<H', self._recv_buffer[-2:])[0]
+                start_sig, = _U16.unpack_from(self._recv_buffer, 0)
+                end_sig, = _U16.unpack_from(self._recv_buffer, len(self._recv_buffer) - 2)
 
                 if start_sig == PACK_START and end_sig == PACK_END:
                     packet_data = bytes(self._recv_buffer[2:-2])
-                    with self.lock:
+                    future = None
+                    if len(packet_data) >= 2:
+                        with self.lock:
+                            future = self._pending.pop((packet_data[0], packet_data[1]), None)
+
+                    if future is not None:
+                        future.set_result(packet_data)
+                    else:
                         self.received_packets.append(packet_data)
                         self.packet_event.set()
 
@@ -16,14 +16,124 @@ The raw IR data format uses timing values where:
 - Bits 0-6 indicate duration in 16us ticks (0-127)
 """
 
-from typing import Optional, List
+import mmap
+import os
+from functools import lru_cache
+from typing import Iterable, Optional, List
+
+# NumPy and Numba are optional and only used by decode_nec. They are
+# imported on its first call rather than with this module, which every
+# TiqiaaIR user loads for encode_nec.
+np = None
+_decoder = None  # backend chosen by _select_decoder
+
+# The Numba decoder is opt-in (TIQIAA_NUMBA=1, or set this before the
+# first decode_nec call), since its JIT compile dwarfs one-off decodes
+USE_NUMBA = os.environ.get("TIQIAA_NUMBA", "") not in ("", "0")
 
 # NEC timing constants
 NEC_PULSE_SIZE = 1125   # 562.5 us * 2 (basic timing unit)
 IR_TICK_SIZE = 32       # 16 us * 2 (device timing resolution)
 MAX_BLOCK_SIZE = 127    # Maximum ticks per timing block
 
+# Optional precomputed encode_nec table (see tools/gen_nec_table.py):
+# 65536 fixed-width frames, indexed by the 16-bit code
+NEC_TABLE_PATH = os.path.join(os.path.dirname(__file__), "_nec_table.bin")
+NEC_TABLE_CODES = 0x10000
+
+
+def _pulse_bytes(start_units: int, count: int, is_high: bool) -> bytes:
+    """
+    Encode a pulse of 'count' NEC timing units as device timing blocks.
+
+    The device tick (16us) does not divide the NEC unit (562.5us), so the
+    block lengths depend on the rounding carried over from earlier pulses.
+    'start_units' is the number of NEC units already emitted in the frame.
+    """
+    start_ticks = start_units * NEC_PULSE_SIZE // IR_TICK_SIZE
+    end_ticks = (start_units + count) * NEC_PULSE_SIZE // IR_TICK_SIZE
+    ticks = end_ticks - start_ticks
+
+    # High bit set for IR ON, applied unconditionally to every block
+    high_mask = 0x80 if is_high else 0x00
+
+    result = bytearray()
+    while ticks > 0:
+        block = min(ticks, MAX_BLOCK_SIZE)
+        ticks -= block
+        result.append(block | high_mask)
+    return bytes(result)
+
+
+# The rounding carry only depends on the unit count modulo IR_TICK_SIZE,
+# so every (mark, space) bit pair can be precomputed for each carry state.
+_LEADER_UNITS = 16 + 8
+_CARRY_STATES = IR_TICK_SIZE
+
+# Leader: 16 units ON (9ms), 8 units OFF (4.5ms)
+_LEADER = _pulse_bytes(0, 16, True) + _pulse_bytes(16, 8, False)
+
+# _BIT_TABLE[state][bit] -> (encoded bit pair, next carry state)
+# Each bit: 1 unit ON, then 1 or 3 units OFF
+_BIT_TABLE = tuple(
+    tuple(
+        (
+            _pulse_bytes(state, 1, True) + _pulse_bytes(state + 1, space, False),
+            (state + 1 + space) % _CARRY_STATES,
+        )
+        for space in (1, 3)
+    )
+    for state in range(_CARRY_STATES)
+)
+
+# Stop bit (1 unit ON) and trailing space (for frame timing), per carry state
+_TAIL_TABLE = tuple(
+    _pulse_bytes(state, 1, True) + _pulse_bytes(state + 1, 72, False)
+    for state in range(_CARRY_STATES)
+)
+
+
+def _encode_frame(full_code: int) -> bytes:
+    """Encode a full 32-bit NEC frame (LSB first) using the lookup tables."""
+    parts = [_LEADER]
+    state = _LEADER_UNITS % _CARRY_STATES
+    bit_table = _BIT_TABLE
 
+    for _ in range(32):
+        pair, state = bit_table[state][full_code & 1]
+        parts.append(pair)
+        full_code >>= 1
+
+    parts.append(_TAIL_TABLE[state])
+    return b''.join(parts)
+
+
+def _load_nec_table():
+    """
+    Map the precomputed NEC table, if present.
+
+    Returns:
+        Tuple of (mmap, entry_size), or (None, 0) if the table is
+        missing or malformed
+    """
+    try:
+        with open(NEC_TABLE_PATH, 'rb') as f:
+            table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None, 0
+
+    entry_size = len(table) // NEC_TABLE_CODES
+    if entry_size == 0 or entry_size * NEC_TABLE_CODES != len(table):
+        table.close()
+        return None, 0
+
+    return table, entry_size
+
+
+_NEC_TABLE, _NEC_ENTRY_SIZE = _load_nec_table()
+
+
+@lru_cache(maxsize=4096)
 def encode_nec(code: int) -> bytes:
     """
     Encode a 16-bit NEC code into raw IR signal data.
@@ -38,11 +148,24 @@ def encode_nec(code: int) -> bytes:
     Returns:
         Raw IR signal data bytes for the Tiqiaa device
 
+    Note:
+        Results are memoized; the returned bytes are immutable and
+        safe to share between callers.
+
     Example:
         >>> data = encode_nec(0x00FF)  # Address 0, Command 255
         >>> len(data) > 0
         True
     """
+    if _NEC_TABLE is not None:
+        offset = (code & 0xFFFF) * _NEC_ENTRY_SIZE
+        return _NEC_TABLE[offset:offset + _NEC_ENTRY_SIZE]
+
+    return _encode_nec_computed(code)
+
+
+def _encode_nec_computed(code: int) -> bytes:
+    """Encode a 16-bit NEC code without the on-disk table."""
     # Extract address and command
     addr = (code >> 8) & 0xFF
     cmd = code & 0xFF
@@ -51,12 +174,24 @@ def encode_nec(code: int) -> bytes:
     # [address] [~address] [command] [~command]
     full_code = addr | ((~addr & 0xFF) << 8) | (cmd << 16) | ((~cmd & 0xFF) << 24)
 
-    result = []
+    return _encode_frame(full_code)
+
+
+def _encode_nec_reference(code: int) -> bytes:
+    """
+    Reference encoder using the original running-time pulse loop.
+
+    Only used at import time to check the lookup tables against it.
+    """
+    addr = (code >> 8) & 0xFF
+    cmd = code & 0xFF
+    full_code = addr | ((~addr & 0xFF) << 8) | (cmd << 16) | ((~cmd & 0xFF) << 24)
+
+    result = bytearray()
     pulse_time = 0
     sender_time = 0
 
     def add_pulse(count: int, is_high: bool):
-        """Add a pulse of 'count' NEC timing units"""
         nonlocal pulse_time, sender_time
         pulse_time += count * NEC_PULSE_SIZE
         ticks = (pulse_time - sender_time) // IR_TICK_SIZE
@@ -66,29 +201,55 @@ def encode_nec(code: int) -> bytes:
             block = min(ticks, MAX_BLOCK_SIZE)
             ticks -= block
             if is_high:
-                block |= 0x80  # Set high bit for IR ON
+                block |= 0x80
             result.append(block)
 
-    # Leader: 16 units ON (9ms), 8 units OFF (4.5ms)
     add_pulse(16, True)
     add_pulse(8, False)
 
-    # Data bits (32 bits, LSB first)
-    for i in range(32):
-        # Each bit: 1 unit ON, then 1 or 3 units OFF
+    for _ in range(32):
         add_pulse(1, True)
         add_pulse(3 if (full_code & 1) else 1, False)
         full_code >>= 1
 
-    # Stop bit: 1 unit ON
     add_pulse(1, True)
-
-    # Trailing space (for frame timing)
     add_pulse(72, False)
 
     return bytes(result)
 
 
+def _check_tables() -> None:
+    """
+    Verify the encoding tables against the reference timing.
+
+    A change to the timing constants must not silently corrupt encoded
+    frames, so a lookup-table mismatch is an error. An on-disk table that
+    disagrees was generated with different constants; it is unmapped and
+    encode_nec falls back to computing frames.
+    """
+    global _NEC_TABLE, _NEC_ENTRY_SIZE
+
+    check_codes = (0x0000, 0xFFFF, 0xAA55)
+
+    for code in check_codes:
+        if _encode_nec_computed(code) != _encode_nec_reference(code):
+            raise RuntimeError(
+                f"NEC lookup tables disagree with reference encoder for 0x{code:04X}"
+            )
+
+    if _NEC_TABLE is not None:
+        for code in check_codes:
+            offset = code * _NEC_ENTRY_SIZE
+            if _NEC_TABLE[offset:offset + _NEC_ENTRY_SIZE] != _encode_nec_computed(code):
+                _NEC_TABLE.close()
+                _NEC_TABLE, _NEC_ENTRY_SIZE = None, 0
+                break
+
+
+_check_tables()
+
+
+@lru_cache(maxsize=4096)
 def encode_nec_extended(address: int, command: int) -> bytes:
     """
     Encode NEC code with extended (16-bit) address.
@@ -109,35 +270,11 @@ def encode_nec_extended(address: int, command: int) -> bytes:
     # Extended format: [addr_low] [addr_high] [command] [~command]
     full_code = addr_low | (addr_high << 8) | (cmd << 16) | ((~cmd & 0xFF) << 24)
 
-    result = []
-    pulse_time = 0
-    sender_time = 0
-
-    def add_pulse(count: int, is_high: bool):
-        nonlocal pulse_time, sender_time
-        pulse_time += count * NEC_PULSE_SIZE
-        ticks = (pulse_time - sender_time) // IR_TICK_SIZE
-        sender_time += ticks * IR_TICK_SIZE
+    return _encode_frame(full_code)
 
-        while ticks > 0:
-            block = min(ticks, MAX_BLOCK_SIZE)
-            ticks -= block
-            if is_high:
-                block |= 0x80
-            result.append(block)
 
-    add_pulse(16, True)
-    add_pulse(8, False)
-
-    for i in range(32):
-        add_pulse(1, True)
-        add_pulse(3 if (full_code & 1) else 1, False)
-        full_code >>= 1
-
-    add_pulse(1, True)
-    add_pulse(72, False)
-
-    return bytes(result)
+# Repeat burst: 16 units ON, 4 units OFF (half of normal space), stop bit
+_REPEAT = _pulse_bytes(0, 16, True) + _pulse_bytes(16, 4, False) + _TAIL_TABLE[16 + 4]
 
 
 def encode_nec_repeat() -> bytes:
@@ -150,32 +287,21 @@ def encode_nec_repeat() -> bytes:
     Returns:
         Raw IR signal data for repeat burst
     """
-    result = []
-    pulse_time = 0
-    sender_time = 0
-
-    def add_pulse(count: int, is_high: bool):
-        nonlocal pulse_time, sender_time
-        pulse_time += count * NEC_PULSE_SIZE
-        ticks = (pulse_time - sender_time) // IR_TICK_SIZE
-        sender_time += ticks * IR_TICK_SIZE
+    return _REPEAT
 
-        while ticks > 0:
-            block = min(ticks, MAX_BLOCK_SIZE)
-            ticks -= block
-            if is_high:
-                block |= 0x80
-            result.append(block)
 
-    # Leader: 16 units ON, 4 units OFF (half of normal space)
-    add_pulse(16, True)
-    add_pulse(4, False)
+def precompute_common(codes: Iterable[int]) -> None:
+    """
+    Warm the encode_nec cache for a set of frequently sent codes.
 
-    # Stop bit
-    add_pulse(1, True)
-    add_pulse(72, False)
+    Args:
+        codes: 16-bit NEC codes to pre-encode
 
-    return bytes(result)
+    Example:
+        >>> precompute_common([0x00FF, 0x1234])
+    """
+    for code in codes:
+        encode_nec(code)
 
 
 def decode_nec(ir_data: bytes) -> Optional[int]:
@@ -192,29 +318,114 @@ def decode_nec(ir_data: bytes) -> Optional[int]:
         This is a best-effort decoder. IR signals can vary, so
         validation against the inverted bytes is performed.
     """
+    global _decoder
+
     if len(ir_data) < 50:  # Too short for valid NEC
         return None
 
-    # Convert raw bytes to timing list
-    timings = []
-    for byte in ir_data:
-        is_high = bool(byte & 0x80)
-        ticks = byte & 0x7F
-        if ticks > 0:
-            timings.append((is_high, ticks * IR_TICK_SIZE))
+    if _decoder is None:
+        _decoder = _select_decoder()
+    return _decoder(ir_data)
+
+
+def _select_decoder():
+    """
+    Import the decoder backend: Numba if enabled, NumPy, then pure Python.
+
+    Numba is only used when USE_NUMBA is set. Compiling the kernel takes
+    hundreds of milliseconds, which is only worth it for long-running
+    processes that decode many frames. If compilation fails, the NumPy
+    decoder is used instead.
+    """
+    global np
+
+    try:
+        import numpy
+    except ImportError:
+        return _decode_nec_py
+    np = numpy
+
+    if not USE_NUMBA:
+        return _decode_nec_np
+
+    try:
+        from numba import njit
+        decode_nb = njit(cache=True)(_decode_nec_nb)
+        # Compile now, for the read-only arrays np.frombuffer returns
+        decode_nb(np.frombuffer(bytes(2), dtype=np.uint8))
+    except Exception:
+        return _decode_nec_np
+
+    def decode(ir_data: bytes) -> Optional[int]:
+        code = decode_nb(np.frombuffer(ir_data, dtype=np.uint8))
+        return code if code >= 0 else None
+
+    return decode
+
+
+def _decode_nec_np(ir_data: bytes) -> Optional[int]:
+    """Vectorized NEC decoder, the default when NumPy is available."""
+    # Drop zero-length blocks, then split level and duration
+    arr = np.frombuffer(ir_data, dtype=np.uint8)
+    arr = arr[(arr & 0x7F) > 0]
+    if len(arr) < 2:
+        return None
+
+    highs = (arr & 0x80) != 0
+    durations = (arr & 0x7F).astype(np.int32) * IR_TICK_SIZE
+
+    # Find potential leader (>8ms high pulse)
+    candidates = np.flatnonzero(highs & (durations > 8000))
+    if not candidates.size:
+        return None
+
+    leader_idx = int(candidates[0])
+    if leader_idx + 65 >= len(arr):
+        return None
+
+    # 32 (mark, space) pairs follow the leader high and space
+    marks = slice(leader_idx + 2, leader_idx + 66, 2)
+    spaces = slice(leader_idx + 3, leader_idx + 67, 2)
+    if not highs[marks].all() or highs[spaces].any():
+        return None  # Invalid pattern
+
+    # Long space = 1; assemble LSB first
+    bits = durations[spaces] > 2000
+    full_code = int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+
+    addr = full_code & 0xFF
+    cmd = (full_code >> 16) & 0xFF
+
+    # Extended address frames fail the inversion check but are
+    # returned anyway, matching the Python decoder
+    return (addr << 8) | cmd
+
+
+# Byte translation tables for splitting timing bytes in C
+_ZERO_BLOCKS = bytes([0x00, 0x80])                  # zero-length blocks
+_HIGH_TABLE = bytes(b >> 7 for b in range(256))     # IR ON flag
+_TICK_TABLE = bytes(b & 0x7F for b in range(256))   # duration in ticks
+
+
+def _decode_nec_py(ir_data: bytes) -> Optional[int]:
+    """Pure-Python NEC decoder used when NumPy is not available."""
+    # Drop zero-length blocks, then split level and duration
+    data = bytes(ir_data).translate(None, _ZERO_BLOCKS)
+    highs = data.translate(_HIGH_TABLE)
+    ticks = data.translate(_TICK_TABLE)
 
     # Look for leader pattern (long high pulse)
-    if len(timings) < 2:
+    if len(data) < 2:
         return None
 
     # Find potential leader
     leader_idx = -1
-    for i, (is_high, duration) in enumerate(timings):
-        if is_high and duration > 8000:  # >8ms, likely leader
+    for i, (is_high, tick) in enumerate(zip(highs, ticks)):
+        if is_high and tick * IR_TICK_SIZE > 8000:  # >8ms, likely leader
             leader_idx = i
             break
 
-    if leader_idx < 0 or leader_idx + 65 >= len(timings):
+    if leader_idx < 0 or leader_idx + 65 >= len(data):
         return None
 
     # Extract 32 data bits
@@ -222,15 +433,13 @@ def decode_nec(ir_data: bytes) -> Optional[int]:
     idx = leader_idx + 2  # Skip leader high and space
 
     for _ in range(32):
-        if idx + 1 >= len(timings):
+        if idx + 1 >= len(data):
             return None
 
         # Each bit: mark + space
-        mark_high, mark_dur = timings[idx]
-        space_high, space_dur = timings[idx + 1]
-
-        if not mark_high or space_high:
+        if not highs[idx] or highs[idx + 1]:
             return None  # Invalid pattern
+        space_dur = ticks[idx + 1] * IR_TICK_SIZE
 
         # Bit 0: short space (~562us = ~1125 ticks)
         # Bit 1: long space (~1687us = ~3375 ticks)
@@ -257,6 +466,58 @@ def decode_nec(ir_data: bytes) -> Optional[int]:
     return (addr << 8) | cmd
 
 
+def _decode_nec_nb(arr):
+    """
+    NEC decoder kernel, compiled with Numba by _select_decoder.
+
+    Mirrors _decode_nec_py on a uint8 array and returns the 16-bit
+    code, or -1 if the data is not valid NEC.
+    """
+    # Drop zero-length blocks, as the Python decoder does
+    timings = np.empty(arr.shape[0], dtype=np.uint8)
+    count = 0
+    for i in range(arr.shape[0]):
+        if arr[i] & 0x7F:
+            timings[count] = arr[i]
+            count += 1
+
+    if count < 2:
+        return -1
+
+    # Find potential leader (long high pulse)
+    leader_idx = -1
+    for i in range(count):
+        if (timings[i] & 0x80) and (timings[i] & 0x7F) * IR_TICK_SIZE > 8000:
+            leader_idx = i
+            break
+
+    if leader_idx < 0 or leader_idx + 65 >= count:
+        return -1
+
+    # Extract 32 data bits (LSB first)
+    full_code = 0
+    idx = leader_idx + 2
+    for i in range(32):
+        if idx + 1 >= count:
+            return -1
+
+        mark = timings[idx]
+        space = timings[idx + 1]
+        if not (mark & 0x80) or (space & 0x80):
+            return -1
+
+        if (space & 0x7F) * IR_TICK_SIZE > 2000:
+            full_code |= 1 << i
+        idx += 2
+
+    addr = full_code & 0xFF
+    cmd = (full_code >> 16) & 0xFF
+
+    # Extended address frames fail the inversion check but are
+    # returned anyway, matching the Python decoder
+    return (addr << 8) | cmd
+
+
 def format_nec_code(code: int) -> str:
     """
     Format NEC code for display.
@@ -17,6 +17,7 @@ EP_IN = 0x81   # Device to host
 PACK_START = 0x5453  # "TS" - packet start marker
 PACK_END = 0x4E45    # "EN" - packet end marker
 MAX_FRAG_SIZE = 56   # Maximum fragment payload size
+REPORT_SIZE = 5 + MAX_FRAG_SIZE  # USB report: 5 header bytes + payload
 MAX_PACKET_SIZE = 1024  # Maximum assembled packet size
 
 # Commands
@@ -35,7 +36,7 @@ STATE_RECV = 19  # Receive mode active
 
 # IR frequency table (Hz) - 30 supported frequencies
 # Index 0 is the default (38kHz), common for most consumer remotes
-IR_FREQ_TABLE = [
+IR_FREQ_TABLE = (
     38000,  # 0 - Most common (NEC, Samsung, LG, etc.)
     37900,  # 1
     37917,  # 2
@@ -66,11 +67,18 @@ IR_FREQ_TABLE = [
     42500,  # 27
     43000,  # 28
     45000,  # 29
-]
+)
 
 # Default frequency for NEC protocol
 DEFAULT_FREQ = 38000
 
+# Reverse lookup: frequency (Hz) -> table index
+_FREQ_INDEX = {freq: index for index, freq in enumerate(IR_FREQ_TABLE)}
+
+# Forward lookup covering every one-byte frequency index (the width of the
+# frequency field in a data packet); unused slots hold DEFAULT_FREQ
+_FREQ_BY_INDEX = IR_FREQ_TABLE + (DEFAULT_FREQ,) * (256 - len(IR_FREQ_TABLE))
+
 
 def get_freq_index(freq: int) -> int:
     """
@@ -82,10 +90,7 @@ def get_freq_index(freq: int) -> int:
     Returns:
         Index into IR_FREQ_TABLE, or 0 if frequency not found
     """
-    try:
-        return IR_FREQ_TABLE.index(freq)
-    except ValueError:
-        return 0
+    return _FREQ_INDEX.get(freq, 0)
 
 
 def get_freq_by_index(index: int) -> int:
@@ -98,6 +103,6 @@ def get_freq_by_index(index: int) -> int:
     Returns:
         Frequency in Hz, or 38000 if index out of range
     """
-    if 0 <= index < len(IR_FREQ_TABLE):
-        return IR_FREQ_TABLE[index]
+    if 0 <= index < 256:
+        return _FREQ_BY_INDEX[index]
     return DEFAULT_FREQ
@@ -5,12 +5,129 @@ This module handles saving and loading IR codes to/from JSON files.
 """
 
 import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Tuple, List, Optional, Dict, Any
+from typing import Tuple, List, Optional, Dict, Any, Iterator
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # Default codes directory (relative to this file or CWD)
 DEFAULT_CODES_DIR = Path("ir_codes")
 
+# Absolute paths of directories already created by get_codes_dir
+_ensured_dirs = set()
+
+# Read a code file and its "_full" variant concurrently in load_smart_code.
+# Only pays off when codes live on high-latency storage (network shares,
+# slow SD cards); on a local disk the thread handoff costs more than it saves.
+_ENABLE_PARALLEL_LOAD = False
+
+# Code listings per directory, invalidated by the directory mtime and by
+# the functions here that add or remove codes: {directory: (mtime_ns, names)}
+_LIST_CACHE: Dict[str, Tuple[int, List[str]]] = {}
+
+# Listings are only cached once the directory mtime is this old. Coarse
+# timestamps (2 s on FAT, some network mounts) would otherwise hide a
+# change made within the same tick as the cached scan.
+_LIST_CACHE_SETTLE_NS = 3_000_000_000
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse JSON bytes (orjson if available)."""
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+
+def _read_json(path) -> Any:
+    """Read and parse a JSON file in binary mode."""
+    with open(path, 'rb') as f:
+        return _loads(f.read())
+
+
+def _write_json(path, data: Any, pretty: bool = False, durable: bool = False) -> None:
+    """
+    Serialize data as JSON and write it in one binary write.
+
+    Output is compact unless pretty is set; indenting is only worth its
+    cost for files meant to be edited by hand. The data is written to a
+    temporary file that is then renamed over the target, so readers never
+    see a partially written file. With durable set, the data is fsynced
+    before the rename.
+    """
+    if HAS_ORJSON:
+        raw = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    elif pretty:
+        raw = json.dumps(data, indent=2).encode()
+    else:
+        raw = json.dumps(data, separators=(',', ':')).encode()
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(raw)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _code_field(data: Dict[str, Any], key: str) -> Optional[bytes]:
+    """
+    Get an IR data field as bytes.
+
+    Codes are stored as a hex string under '<key>_hex'; files written by
+    older versions store a list of byte values under '<key>'.
+    """
+    hex_value = data.get(f"{key}_hex")
+    if hex_value is not None:
+        return bytes.fromhex(hex_value)
+    value = data.get(key)
+    return bytes(value) if value is not None else None
+
+
+def _code_path(directory: Path, name: str) -> str:
+    """Build the path string of a code file without allocating Path objects."""
+    return f"{directory}{os.sep}{name}.ir"
+
+
+def _read_file(path: str) -> Optional[bytes]:
+    """Read the raw contents of a file, or None if it does not exist."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _read_code_file(name: str, codes_dir: Optional[Path] = None) -> Optional[bytes]:
+    """Read the raw contents of a code file, or None if it does not exist."""
+    return _read_file(_code_path(get_codes_dir(codes_dir), name))
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int]]:
+    """Get a file's (mtime_ns, size) cache key, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _invalidate_list_cache(directory: Path) -> None:
+    """Drop the cached listing of a directory after codes are added or removed."""
+    _LIST_CACHE.pop(os.path.abspath(directory), None)
+
 
 def get_codes_dir(codes_dir: Optional[Path] = None) -> Path:
     """
@@ -23,7 +140,13 @@ def get_codes_dir(codes_dir: Optional[Path] = None) -> Path:
         Path to the codes directory
     """
     path = codes_dir or DEFAULT_CODES_DIR
-    path.mkdir(exist_ok=True)
+
+    # Keyed on the absolute path so a changed working directory is noticed
+    key = os.path.abspath(path)
+    if key not in _ensured_dirs:
+        path.mkdir(exist_ok=True)
+        _ensured_dirs.add(key)
+
     return path
 
 
@@ -34,7 +157,8 @@ def save_ir_code(
     codes_dir: Optional[Path] = None,
     learned_from: Optional[str] = None,
     notes: Optional[str] = None,
-    tap_data: Optional[bytes] = None
+    tap_data: Optional[bytes] = None,
+    durable: bool = False
 ) -> Path:
     """
     Save IR code to a JSON file.
@@ -47,6 +171,8 @@ def save_ir_code(
         learned_from: Optional source description (e.g., "Samsung TV Remote")
         notes: Optional notes about the code
         tap_data: Optional separate data for tap (short press) behavior
+        durable: Flush the file to disk (fsync) before it replaces any
+            existing code; slower, but survives power loss
 
     Returns:
         Path to the saved file
@@ -55,16 +181,16 @@ def save_ir_code(
         >>> path = save_ir_code("power", b'\\x8f\\x7f...', learned_from="My TV Remote")
     """
     directory = get_codes_dir(codes_dir)
-    filepath = directory / f"{name}.ir"
+    filepath = _code_path(directory, name)
 
     data: Dict[str, Any] = {
         "name": name,
         "frequency": freq,
-        "data": list(ir_data)
+        "data_hex": ir_data.hex()
     }
 
     if tap_data is not None:
-        data["tap"] = list(tap_data)
+        data["tap_hex"] = tap_data.hex()
 
     if learned_from:
         data["learned_from"] = learned_from
@@ -72,10 +198,11 @@ def save_ir_code(
     if notes:
         data["notes"] = notes
 
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2)
+    # Single code files stay indented so they can be edited by hand
+    _write_json(filepath, data, pretty=True, durable=durable)
+    _invalidate_list_cache(directory)
 
-    return filepath
+    return Path(filepath)
 
 
 def load_ir_code(
@@ -98,15 +225,22 @@ def load_ir_code(
         ...     print(f"Loaded {len(data)} bytes at {freq}Hz")
     """
     directory = get_codes_dir(codes_dir)
-    filepath = directory / f"{name}.ir"
+    filepath = _code_path(directory, name)
 
-    if not filepath.exists():
+    try:
+        st = os.stat(filepath)
+    except FileNotFoundError:
         return None, 38000
 
-    with open(filepath, 'r') as f:
-        data = json.load(f)
+    return _load_ir_code_cached(filepath, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=256)
+def _load_ir_code_cached(path: str, mtime_ns: int, size: int) -> Tuple[bytes, int]:
+    """Parse a code file; keyed on mtime and size so edits are picked up."""
+    data = _read_json(path)
 
-    ir_data = bytes(data["data"])
+    ir_data = _code_field(data, "data")
     freq = data.get("frequency", 38000)
 
     return ir_data, freq
@@ -126,19 +260,19 @@ def load_ir_code_full(
     Returns:
         Dictionary with all code data, or None if not found
     """
-    directory = get_codes_dir(codes_dir)
-    filepath = directory / f"{name}.ir"
-
-    if not filepath.exists():
+    raw = _read_code_file(name, codes_dir)
+    if raw is None:
         return None
 
-    with open(filepath, 'r') as f:
-        data = json.load(f)
+    data = _loads(raw)
 
-    # Convert data arrays to bytes
-    data["data"] = bytes(data["data"])
-    if "tap" in data:
-        data["tap"] = bytes(data["tap"])
+    # Convert stored data (hex or byte list) to bytes
+    data["data"] = _code_field(data, "data")
+    tap_code = _code_field(data, "tap")
+    if tap_code is not None:
+        data["tap"] = tap_code
+    data.pop("data_hex", None)
+    data.pop("tap_hex", None)
 
     return data
 
@@ -154,6 +288,44 @@ def load_smart_code(
     - Tap (short press): sends tap code (or data if no tap field)
     - Hold: sends full data code repeatedly
 
+    Args:
+        name: Code name
+        codes_dir: Optional custom directory
+
+    Returns:
+        Dictionary with 'tap', 'full', and 'freq' keys, or None
+    """
+    full_name = f"{name}_full"
+
+    if _ENABLE_PARALLEL_LOAD:
+        # Overlap both reads; the "_full" file may turn out to be unneeded
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            raw_future = pool.submit(_read_code_file, name, codes_dir)
+            full_future = pool.submit(_read_code_file, full_name, codes_dir)
+            raw = raw_future.result()
+            full_raw = full_future.result()
+        read_full = lambda: full_raw
+    else:
+        raw = _read_code_file(name, codes_dir)
+        read_full = lambda: _read_code_file(full_name, codes_dir)
+
+    if raw is None:
+        return None
+
+    return _parse_smart_code(raw, read_full)
+
+
+def load_smart_code_cached(
+    name: str,
+    codes_dir: Optional[Path] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Load IR code with tap/full variants, reusing unchanged results.
+
+    Same as load_smart_code, but the parsed code is cached until the code
+    file or its "_full" variant changes on disk. Repeated loads of an
+    unchanged code return the same dictionary, which must not be modified.
+
     Args:
         name: Code name
         codes_dir: Optional custom directory
@@ -162,33 +334,54 @@ def load_smart_code(
         Dictionary with 'tap', 'full', and 'freq' keys, or None
     """
     directory = get_codes_dir(codes_dir)
-    filepath = directory / f"{name}.ir"
+    path = _code_path(directory, name)
+    full_path = _code_path(directory, f"{name}_full")
+
+    key = _stat_key(path)
+    if key is None:
+        return None
+
+    return _load_smart_code_cached(path, *key, full_path, _stat_key(full_path))
 
-    if not filepath.exists():
+
+@lru_cache(maxsize=256)
+def _load_smart_code_cached(
+    path: str,
+    mtime_ns: int,
+    size: int,
+    full_path: str,
+    full_key: Optional[Tuple[int, int]]
+) -> Optional[Dict[str, Any]]:
+    """Parse a smart code; keyed on mtime and size of both files so edits are picked up."""
+    raw = _read_file(path)
+    if raw is None:
         return None
 
-    with open(filepath, 'r') as f:
-        data = json.load(f)
+    return _parse_smart_code(raw, lambda: _read_file(full_path))
+
+
+def _parse_smart_code(raw: bytes, read_full) -> Dict[str, Any]:
+    """Build the tap/full/freq dictionary from a code file and its "_full" reader."""
+    data = _loads(raw)
 
     # Tap code - use 'tap' field or 'data'
-    tap_data = data.get('tap', data['data'])
-    tap_code = bytes(tap_data)
+    data_code = _code_field(data, 'data')
+    tap_code = _code_field(data, 'tap')
+    if tap_code is None:
+        tap_code = data_code
 
     # Full code for hold mode
     full_code = None
 
     # Check if data field is full-length NEC (~80-120 bytes)
-    data_field = data.get('data', [])
-    if 80 <= len(data_field) <= 120:
-        full_code = bytes(data_field)
+    if data_code is not None and 80 <= len(data_code) <= 120:
+        full_code = data_code
 
     # Check for a "_full" variant file
     if full_code is None:
-        full_filepath = directory / f"{name}_full.ir"
-        if full_filepath.exists():
-            with open(full_filepath, 'r') as f:
-                full_data = json.load(f)
-            full_code = bytes(full_data.get('data', []))
+        full_raw = read_full()
+        if full_raw is not None:
+            full_code = _code_field(_loads(full_raw), 'data') or b''
 
     # Fallback to tap code
     if full_code is None:
@@ -218,10 +411,52 @@ def list_ir_codes(codes_dir: Optional[Path] = None) -> List[str]:
     """
     directory = get_codes_dir(codes_dir)
 
-    if not directory.exists():
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except FileNotFoundError:
         return []
 
-    return sorted([f.stem for f in directory.glob("*.ir")])
+    key = os.path.abspath(directory)
+    cached = _LIST_CACHE.get(key)
+    if cached is None or cached[0] != mtime_ns:
+        with os.scandir(directory) as it:
+            names = [e.name[:-3] for e in it if e.name.endswith(".ir") and e.is_file()]
+        cached = (mtime_ns, sorted(names))
+        if time.time_ns() - mtime_ns > _LIST_CACHE_SETTLE_NS:
+            _LIST_CACHE[key] = cached
+
+    return list(cached[1])
+
+
+def iter_ir_codes(codes_dir: Optional[Path] = None) -> Iterator[Tuple[str, int]]:
+    """
+    Iterate saved IR codes with their file sizes, without opening them.
+
+    Uses a single directory scan. The size is that of the .ir file on
+    disk, an upper bound on the IR data size.
+
+    Args:
+        codes_dir: Optional custom directory
+
+    Yields:
+        Tuples of (code name, file size in bytes), sorted by name
+
+    Example:
+        >>> for name, size in iter_ir_codes():
+        ...     print(f"  - {name} ({size} byte file)")
+    """
+    directory = get_codes_dir(codes_dir)
+
+    try:
+        with os.scandir(directory) as it:
+            entries = [
+                (e.name[:-3], e.stat().st_size)
+                for e in it if e.name.endswith(".ir") and e.is_file()
+            ]
+    except FileNotFoundError:
+        return
+
+    yield from sorted(entries)
 
 
 def delete_ir_code(name: str, codes_dir: Optional[Path] = None) -> bool:
@@ -236,12 +471,13 @@ def delete_ir_code(name: str, codes_dir: Optional[Path] = None) -> bool:
         True if deleted, False if not found
     """
     directory = get_codes_dir(codes_dir)
-    filepath = directory / f"{name}.ir"
 
-    if filepath.exists():
-        filepath.unlink()
-        return True
-    return False
+    try:
+        os.unlink(_code_path(directory, name))
+    except FileNotFoundError:
+        return False
+    _invalidate_list_cache(directory)
+    return True
 
 
 def export_codes(
@@ -252,6 +488,12 @@ def export_codes(
     """
     Export multiple IR codes to a single JSON file.
 
+    Code files are already JSON, so their contents are streamed into the
+    export file as-is rather than parsed and re-serialized (each is only
+    validated, and files that are not valid JSON are skipped). The wrapper
+    object itself is written compactly. The export is written to a
+    temporary file that replaces output_file once complete.
+
     Args:
         output_file: Output file path
         codes_dir: Optional codes directory
@@ -265,17 +507,38 @@ def export_codes(
     if names is None:
         names = list_ir_codes(codes_dir)
 
-    codes = {}
-    for name in names:
-        filepath = directory / f"{name}.ir"
-        if filepath.exists():
-            with open(filepath, 'r') as f:
-                codes[name] = json.load(f)
-
-    with open(output_file, 'w') as f:
-        json.dump({"ir_codes": codes, "version": 1}, f, indent=2)
-
-    return len(codes)
+    exported = set()
+    tmp_path = f"{output_file}.tmp"
+    try:
+        with open(tmp_path, 'wb') as out:
+            out.write(b'{"ir_codes":{')
+            for name in names:
+                if name in exported:
+                    continue
+                raw = _read_code_file(name, directory)
+                if raw is None:
+                    continue
+                raw = raw.strip()
+
+                # An empty or corrupt file would make the whole export invalid
+                try:
+                    _loads(raw)
+                except ValueError:
+                    continue
+
+                separator = b',' if exported else b''
+                out.write(separator + json.dumps(name).encode() + b':' + raw)
+                exported.add(name)
+            out.write(b'},"version":1}\n')
+        os.replace(tmp_path, output_file)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    return len(exported)
 
 
 def import_codes(
@@ -286,6 +549,8 @@ def import_codes(
     """
     Import IR codes from an export file.
 
+    Imported code files are written as compact JSON.
+
     Args:
         input_file: Input file path
         codes_dir: Optional codes directory
@@ -296,21 +561,23 @@ def import_codes(
     """
     directory = get_codes_dir(codes_dir)
 
-    with open(input_file, 'r') as f:
-        data = json.load(f)
+    data = _read_json(input_file)
 
     codes = data.get("ir_codes", data)  # Support old format without wrapper
     if not isinstance(codes, dict):
         return 0
 
+    # One directory scan instead of an exists() check per code
+    existing = set() if overwrite else set(list_ir_codes(codes_dir))
+
     imported = 0
     for name, code_data in codes.items():
-        filepath = directory / f"{name}.ir"
-        if filepath.exists() and not overwrite:
+        if name in existing:
             continue
 
-        with open(filepath, 'w') as f:
-            json.dump(code_data, f, indent=2)
+        _write_json(_code_path(directory, name), code_data)
         imported += 1
 
+    if imported:
+        _invalidate_list_cache(directory)
     return imported
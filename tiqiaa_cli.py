@@ -21,20 +21,45 @@ import time
 import argparse
 from pathlib import Path
 
+# Only storage helpers are imported up front; the USB driver and NEC
+# utilities are imported by the commands that need them
 from tiqiaa import (
-    TiqiaaIR,
     save_ir_code,
     load_ir_code,
     list_ir_codes,
+    iter_ir_codes,
     delete_ir_code,
-    decode_nec,
-    format_nec_code,
     __version__,
 )
 
+_DESCRIPTION = "Tiqiaa TView USB IR - Command Line Interface"
+
+_EPILOG = """
+Examples:
+  %(prog)s learn power              Learn and save an IR code named 'power'
+  %(prog)s send power               Send the saved 'power' code
+  %(prog)s send power -r 3          Send 'power' code 3 times
+  %(prog)s send-nec 0x00FF          Send NEC code (address=0x00, cmd=0xFF)
+  %(prog)s list                     List all saved codes
+  %(prog)s list -v                  List codes with data size and frequency
+  %(prog)s test                     Test device with sample codes
+  %(prog)s receive -c 5             Receive and display 5 IR signals
+
+Based on protocol work from: https://gitlab.com/XenRE/tiqiaa-usb-ir
+"""
+
+# Command defaults
+_DEFAULT_TIMEOUT = 15
+_DEFAULT_FREQ = 38000
+_DEFAULT_REPEAT = 1
+_DEFAULT_DELAY = 0.1
+_DEFAULT_COUNT = 1
+
 
 def cmd_learn(args):
     """Learn an IR code and save it."""
+    from tiqiaa import TiqiaaIR, decode_nec, format_nec_code
+
     name = args.name
 
     ir = TiqiaaIR()
@@ -42,7 +67,7 @@ def cmd_learn(args):
         return 1
 
     try:
-        timeout = args.timeout or 15
+        timeout = args.timeout or _DEFAULT_TIMEOUT
         print(f"\nLearning IR code: {name}")
 
         ir_data = ir.receive_ir(timeout_sec=timeout)
@@ -56,7 +81,7 @@ def cmd_learn(args):
             filepath = save_ir_code(
                 name,
                 ir_data,
-                freq=args.freq or 38000,
+                freq=args.freq or _DEFAULT_FREQ,
                 learned_from=args.source,
                 notes=args.notes
             )
@@ -71,6 +96,8 @@ def cmd_learn(args):
 
 def cmd_send(args):
     """Send a saved IR code."""
+    from tiqiaa import TiqiaaIR
+
     name = args.name
 
     ir_data, freq = load_ir_code(name)
@@ -84,16 +111,15 @@ def cmd_send(args):
         return 1
 
     try:
-        repeat = args.repeat or 1
-        delay = args.delay or 0.1
+        repeat = args.repeat or _DEFAULT_REPEAT
+        delay = args.delay or _DEFAULT_DELAY
 
         print(f"Sending '{name}' ({len(ir_data)} bytes at {freq}Hz)")
-        for i in range(repeat):
-            ir.send_ir(ir_data, freq)
-            if repeat > 1:
-                print(f"  Sent {i + 1}/{repeat}")
-            if i < repeat - 1:
-                time.sleep(delay)
+        if not ir.send_ir(ir_data, freq, repeat=repeat, interval=delay):
+            print("Send failed")
+            return 1
+        if repeat > 1:
+            print(f"  Sent {repeat} times")
 
         print("Done!")
         return 0
@@ -103,6 +129,8 @@ def cmd_send(args):
 
 def cmd_send_nec(args):
     """Send a raw NEC code."""
+    from tiqiaa import TiqiaaIR, format_nec_code
+
     try:
         code = int(args.code, 0)  # Auto-detect base (0x for hex)
     except ValueError:
@@ -119,16 +147,15 @@ def cmd_send_nec(args):
         return 1
 
     try:
-        repeat = args.repeat or 1
-        delay = args.delay or 0.1
+        repeat = args.repeat or _DEFAULT_REPEAT
+        delay = args.delay or _DEFAULT_DELAY
 
         print(f"Sending NEC {format_nec_code(code)}")
-        for i in range(repeat):
-            ir.send_nec(code)
-            if repeat > 1:
-                print(f"  Sent {i + 1}/{repeat}")
-            if i < repeat - 1:
-                time.sleep(delay)
+        if not ir.send_nec(code, repeat=repeat, interval=delay):
+            print("Send failed")
+            return 1
+        if repeat > 1:
+            print(f"  Sent {repeat} times")
 
         print("Done!")
         return 0
@@ -138,7 +165,7 @@ def cmd_send_nec(args):
 
 def cmd_list(args):
     """List saved IR codes."""
-    codes = list_ir_codes()
+    codes = list(iter_ir_codes())
 
     if not codes:
         print("No IR codes saved yet")
@@ -146,10 +173,14 @@ def cmd_list(args):
         return 0
 
     print(f"Saved IR codes ({len(codes)}):")
-    for name in codes:
-        ir_data, freq = load_ir_code(name)
-        size = len(ir_data) if ir_data else 0
-        print(f"  - {name} ({size} bytes, {freq}Hz)")
+    for name, file_size in codes:
+        if args.verbose:
+            # Exact data size and frequency require parsing the file
+            ir_data, freq = load_ir_code(name)
+            size = len(ir_data) if ir_data else 0
+            print(f"  - {name} ({size} bytes, {freq}Hz)")
+        else:
+            print(f"  - {name} ({file_size} byte file)")
 
     return 0
 
@@ -168,6 +199,8 @@ def cmd_delete(args):
 
 def cmd_test(args):
     """Test IR transmission."""
+    from tiqiaa import TiqiaaIR, format_nec_code
+
     ir = TiqiaaIR()
     if not ir.open():
         return 1
@@ -193,6 +226,8 @@ def cmd_test(args):
 
 def cmd_info(args):
     """Show device info."""
+    from tiqiaa import TiqiaaIR
+
     print(f"Tiqiaa TView IR Library v{__version__}")
     print()
 
@@ -221,13 +256,15 @@ def cmd_info(args):
 
 def cmd_receive(args):
     """Receive and display IR signals without saving."""
+    from tiqiaa import TiqiaaIR, decode_nec, format_nec_code
+
     ir = TiqiaaIR()
     if not ir.open():
         return 1
 
     try:
-        timeout = args.timeout or 15
-        count = args.count or 1
+        timeout = args.timeout or _DEFAULT_TIMEOUT
+        count = args.count or _DEFAULT_COUNT
 
         print(f"\nReceive mode - waiting for {count} signal(s)")
 
@@ -239,7 +276,7 @@ def cmd_receive(args):
             if ir_data:
                 print(f"Data ({len(ir_data)} bytes):")
                 # Print hex dump
-                hex_str = ' '.join(f'{b:02X}' for b in ir_data[:64])
+                hex_str = ir_data[:64].hex(' ').upper()
                 print(f"  {hex_str}")
                 if len(ir_data) > 64:
                     print(f"  ... ({len(ir_data) - 64} more bytes)")
@@ -259,22 +296,12 @@ def cmd_receive(args):
         ir.close()
 
 
-def main():
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with all subcommands."""
     parser = argparse.ArgumentParser(
-        description="Tiqiaa TView USB IR - Command Line Interface",
+        description=_DESCRIPTION,
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  %(prog)s learn power              Learn and save an IR code named 'power'
-  %(prog)s send power               Send the saved 'power' code
-  %(prog)s send power -r 3          Send 'power' code 3 times
-  %(prog)s send-nec 0x00FF          Send NEC code (address=0x00, cmd=0xFF)
-  %(prog)s list                     List all saved codes
-  %(prog)s test                     Test device with sample codes
-  %(prog)s receive -c 5             Receive and display 5 IR signals
-
-Based on protocol work from: https://gitlab.com/XenRE/tiqiaa-usb-ir
-"""
+        epilog=_EPILOG
     )
 
     parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
@@ -284,10 +311,10 @@ Based on protocol work from: https://gitlab.com/XenRE/tiqiaa-usb-ir
     # learn
     learn_parser = subparsers.add_parser('learn', help='Learn an IR code and save it')
     learn_parser.add_argument('name', help='Name for the IR code')
-    learn_parser.add_argument('-t', '--timeout', type=int, default=15,
-                              help='Timeout in seconds (default: 15)')
-    learn_parser.add_argument('-f', '--freq', type=int, default=38000,
-                              help='IR frequency in Hz (default: 38000)')
+    learn_parser.add_argument('-t', '--timeout', type=int, default=_DEFAULT_TIMEOUT,
+                              help=f'Timeout in seconds (default: {_DEFAULT_TIMEOUT})')
+    learn_parser.add_argument('-f', '--freq', type=int, default=_DEFAULT_FREQ,
+                              help=f'IR frequency in Hz (default: {_DEFAULT_FREQ})')
     learn_parser.add_argument('-s', '--source', help='Source description (e.g., "Samsung TV Remote")')
     learn_parser.add_argument('-n', '--notes', help='Notes about this code')
     learn_parser.set_defaults(func=cmd_learn)
@@ -295,23 +322,25 @@ Based on protocol work from: https://gitlab.com/XenRE/tiqiaa-usb-ir
     # send
     send_parser = subparsers.add_parser('send', help='Send a saved IR code')
     send_parser.add_argument('name', help='Name of the IR code to send')
-    send_parser.add_argument('-r', '--repeat', type=int, default=1,
-                             help='Number of times to send (default: 1)')
-    send_parser.add_argument('-d', '--delay', type=float, default=0.1,
-                             help='Delay between repeats in seconds (default: 0.1)')
+    send_parser.add_argument('-r', '--repeat', type=int, default=_DEFAULT_REPEAT,
+                             help=f'Number of times to send (default: {_DEFAULT_REPEAT})')
+    send_parser.add_argument('-d', '--delay', type=float, default=_DEFAULT_DELAY,
+                             help=f'Time between repeat starts in seconds (default: {_DEFAULT_DELAY})')
     send_parser.set_defaults(func=cmd_send)
 
     # send-nec
     nec_parser = subparsers.add_parser('send-nec', help='Send a raw NEC code')
     nec_parser.add_argument('code', help='NEC code in hex (0x1234) or decimal')
-    nec_parser.add_argument('-r', '--repeat', type=int, default=1,
-                            help='Number of times to send (default: 1)')
-    nec_parser.add_argument('-d', '--delay', type=float, default=0.1,
-                            help='Delay between repeats in seconds (default: 0.1)')
+    nec_parser.add_argument('-r', '--repeat', type=int, default=_DEFAULT_REPEAT,
+                            help=f'Number of times to send (default: {_DEFAULT_REPEAT})')
+    nec_parser.add_argument('-d', '--delay', type=float, default=_DEFAULT_DELAY,
+                            help=f'Time between repeat starts in seconds (default: {_DEFAULT_DELAY})')
     nec_parser.set_defaults(func=cmd_send_nec)
 
     # list
     list_parser = subparsers.add_parser('list', help='List saved IR codes')
+    list_parser.add_argument('-v', '--verbose', action='store_true',
+                             help='Show exact data size and frequency (reads each file)')
     list_parser.set_defaults(func=cmd_list)
 
     # delete
@@ -329,16 +358,24 @@ Based on protocol work from: https://gitlab.com/XenRE/tiqiaa-usb-ir
 
     # receive
     receive_parser = subparsers.add_parser('receive', help='Receive and display IR signals')
-    receive_parser.add_argument('-t', '--timeout', type=int, default=15,
-                                help='Timeout per signal in seconds (default: 15)')
-    receive_parser.add_argument('-c', '--count', type=int, default=1,
-                                help='Number of signals to receive (default: 1)')
+    receive_parser.add_argument('-t', '--timeout', type=int, default=_DEFAULT_TIMEOUT,
+                                help=f'Timeout per signal in seconds (default: {_DEFAULT_TIMEOUT})')
+    receive_parser.add_argument('-c', '--count', type=int, default=_DEFAULT_COUNT,
+                                help=f'Number of signals to receive (default: {_DEFAULT_COUNT})')
     receive_parser.set_defaults(func=cmd_receive)
 
-    args = parser.parse_args()
+    return parser
+
+
+# Built once and reused by every main() call
+_PARSER = _build_parser()
+
+
+def main():
+    args = _PARSER.parse_args()
 
     if args.command is None:
-        parser.print_help()
+        _PARSER.print_help()
         return 0
 
     return args.func(args)
@@ -15,13 +15,15 @@ Based on protocol work from: https://gitlab.com/XenRE/tiqiaa-usb-ir
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+import queue
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from tiqiaa import (
     TiqiaaIR,
     list_ir_codes,
-    load_smart_code,
+    load_smart_code_cached,
     save_ir_code,
     delete_ir_code,
     __version__,
@@ -38,10 +40,26 @@ class IRRemoteGUI:
         self.root.minsize(400, 300)
 
         self.ir = None
-        self.sending = False
-        self.send_thread = None
+        self._stop = threading.Event()  # set when the current send should end
+        self._stop.set()
         self.current_code = None
-        self.send_lock = threading.Lock()
+        self._codes_cache = None
+        # code name -> (loaded code, (tap packet, full packet))
+        self._encoded_cache = {}
+
+        # One long-lived sender thread runs the sends queued by code
+        # presses as (code name, stop event) items; None shuts it down
+        self._cmd_q = queue.SimpleQueue()
+        self._idle = threading.Event()  # set while the sender has no send running
+        self._idle.set()
+        self._sender = threading.Thread(target=self._sender_main, daemon=True)
+        self._sender.start()
+
+        # Shared pool for blocking device I/O (connect and learn)
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+        self._learn_future = None
+        self._learn_cancel = threading.Event()
+        self._closing = False  # set once the window starts closing
 
         self._setup_ui()
         self._connect_device()
@@ -70,11 +88,41 @@ class IRRemoteGUI:
         )
         hint_label.grid(row=1, column=0, columnspan=3, pady=(0, 10), sticky="w")
 
-        # IR codes buttons frame
-        self.buttons_frame = ttk.LabelFrame(main_frame, text="IR Codes", padding="5")
-        self.buttons_frame.grid(row=2, column=0, sticky="nsew", pady=(0, 10))
+        # IR codes frame
+        self.codes_frame = ttk.LabelFrame(main_frame, text="IR Codes", padding="5")
+        self.codes_frame.grid(row=2, column=0, sticky="nsew", pady=(0, 10))
+
+        # Code list: one Treeview row per code (row ID = code name), which
+        # is far cheaper to build and refresh than a widget per code
+        style = ttk.Style(self.root)
+        style.configure('Codes.Treeview', font=('Arial', 10, 'bold'), rowheight=28)
+        self.tree = ttk.Treeview(
+            self.codes_frame,
+            show='tree',
+            selectmode='browse',
+            style='Codes.Treeview'
+        )
+        self.tree.grid(row=0, column=0, sticky="nsew")
+
+        scrollbar = ttk.Scrollbar(self.codes_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        self.codes_frame.columnconfigure(0, weight=1)
+        self.codes_frame.rowconfigure(0, weight=1)
+
+        # Bind mouse events for click/hold behavior
+        self.tree.bind('<ButtonPress-1>', self._on_press_event)
+        self.tree.bind('<ButtonRelease-1>', self._on_release_event)
+
+        # Shown in place of the list when there are no codes
+        self.empty_label = ttk.Label(
+            self.codes_frame,
+            text="No IR codes found.\nUse 'Learn New' to add codes.",
+            justify=tk.CENTER
+        )
 
-        self._load_buttons()
+        self._load_codes()
 
         # Control buttons frame
         control_frame = ttk.Frame(main_frame)
@@ -104,128 +152,200 @@ class IRRemoteGUI:
         main_frame.columnconfigure(0, weight=1)
         main_frame.rowconfigure(2, weight=1)
 
-    def _load_buttons(self):
-        """Load IR code buttons into the grid."""
-        # Clear existing buttons
-        for widget in self.buttons_frame.winfo_children():
-            widget.destroy()
-
-        codes = list_ir_codes()
-
-        if not codes:
-            ttk.Label(
-                self.buttons_frame,
-                text="No IR codes found.\nUse 'Learn New' to add codes.",
-                justify=tk.CENTER
-            ).grid(padx=20, pady=20)
+    def _post(self, callback, *args):
+        """Run callback on the Tk thread from any thread, unless the window is closing."""
+        if self._closing:
             return
+        try:
+            self.root.after_idle(callback, *args)
+        except (tk.TclError, RuntimeError):
+            pass  # Window destroyed between the check and the call
+
+    def _set_status(self, text: str):
+        """Update the status bar from any thread (applied on the Tk thread)."""
+        self._post(self.status_var.set, text)
+
+    def _cached_list_codes(self):
+        """Get saved code names, scanning the codes directory only on a miss."""
+        if self._codes_cache is None:
+            self._codes_cache = list_ir_codes()
+        return self._codes_cache
+
+    def _invalidate_codes(self):
+        """Forget the cached code list after codes are saved or deleted."""
+        self._codes_cache = None
+
+    def _get_packets(self, code_name: str):
+        """Get the encoded (tap, full) packets for a code, loading it on a miss."""
+        # Unreadable or malformed files (bad JSON, bad hex, wrong field
+        # types) are reported through the caller's "Error loading" status
+        try:
+            # Storage hands back the same code object until either file
+            # changes on disk, so unchanged codes are not re-encoded
+            codes = load_smart_code_cached(code_name)
+            if codes is None or codes['tap'] is None:
+                return None
+
+            entry = self._encoded_cache.get(code_name)
+            if entry is not None and entry[0] is codes:
+                return entry[1]
+
+            freq = codes['freq']
+            tap_packet = TiqiaaIR.encode_ir(codes['tap'], freq)
+            if codes['full'] is codes['tap']:
+                full_packet = tap_packet
+            else:
+                full_packet = TiqiaaIR.encode_ir(codes['full'], freq)
+        except (OSError, ValueError, TypeError):
+            return None
 
-        # Create button grid
-        cols = 3
-        for i, name in enumerate(codes):
-            row = i // cols
-            col = i % cols
-
-            btn = tk.Button(
-                self.buttons_frame,
-                text=name,
-                width=15,
-                height=2,
-                font=('Arial', 10, 'bold'),
-                bg='#e0e0e0',
-                activebackground='#c0c0c0'
-            )
-            btn.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
+        packets = (tap_packet, full_packet)
+        self._encoded_cache[code_name] = (codes, packets)
+        return packets
 
-            # Bind mouse events for click/hold behavior
-            btn.bind('<ButtonPress-1>', lambda e, n=name: self._on_press(n))
-            btn.bind('<ButtonRelease-1>', lambda e: self._on_release())
+    def _load_codes(self):
+        """Load the saved IR codes into the code list."""
+        codes = self._cached_list_codes()
 
-        # Configure column weights
-        for c in range(cols):
-            self.buttons_frame.columnconfigure(c, weight=1)
+        rows = self.tree.get_children()
+        if rows:
+            self.tree.delete(*rows)
+        for name in codes:
+            self.tree.insert('', tk.END, iid=name, text=name)
+
+        if codes:
+            self.empty_label.grid_remove()
+        else:
+            self.empty_label.grid(row=0, column=0, padx=20, pady=20)
 
     def _connect_device(self):
         """Connect to the IR device in background thread."""
         def connect():
             self.ir = TiqiaaIR()
             if self.ir.open(verbose=False):
-                self.status_var.set("Connected - Ready to send")
+                self._set_status("Connected - Ready to send")
             else:
-                self.status_var.set("Device not found - Click Refresh")
+                self._set_status("Device not found - Click Refresh")
                 self.ir = None
 
-        threading.Thread(target=connect, daemon=True).start()
+        self._io_pool.submit(connect)
+
+    def _on_press_event(self, event):
+        """Mouse press on the code list: start sending the code under the pointer."""
+        code_name = self.tree.identify_row(event.y)
+        if code_name:
+            self._on_press(code_name)
+
+    def _on_release_event(self, event):
+        """Mouse release on the code list."""
+        self._on_release()
 
     def _on_press(self, code_name: str):
-        """Handle button press - start sending."""
+        """Handle press on a code - start sending."""
         if not self.ir:
             self.status_var.set("Device not connected! Click Refresh")
             return
 
         # Stop any previous send
-        self.sending = False
-        if self.send_thread and self.send_thread.is_alive():
-            self.send_thread.join(timeout=0.05)
+        self._cancel_send()
 
-        self.sending = True
+        # Each send gets its own stop event, so a previous loop that has
+        # not exited yet cannot be resumed by this one
+        self._stop = threading.Event()
         self.current_code = code_name
         self.status_var.set(f"Sending: {code_name}")
 
-        # Start send loop in background
-        self.send_thread = threading.Thread(
-            target=self._send_loop,
-            args=(code_name,),
-            daemon=True
-        )
-        self.send_thread.start()
+        # Hand the send to the sender thread
+        self._cmd_q.put((code_name, self._stop))
 
     def _on_release(self):
-        """Handle button release - stop sending."""
-        self.sending = False
+        """Handle release - stop sending."""
+        self._cancel_send()
         if self.current_code:
             self.status_var.set(f"Sent: {self.current_code}")
         self.current_code = None
 
-    def _send_loop(self, code_name: str):
-        """Background thread for sending IR codes."""
-        codes = load_smart_code(code_name)
-        if codes is None:
-            self.status_var.set(f"Error loading: {code_name}")
+    def _sender_main(self):
+        """Sender thread: run queued sends one at a time until shut down."""
+        while True:
+            item = self._cmd_q.get()
+            if item is None:
+                break
+            self._idle.clear()
+            try:
+                self._send_loop(*item)
+            except Exception as e:
+                # Keep the one sender thread alive for the next press
+                self._set_status(f"Error: {e}")
+            finally:
+                self._idle.set()
+
+    def _cancel_send(self, wait: bool = False):
+        """
+        Stop the current send.
+
+        Presses and releases only signal the sender thread. Refresh and
+        close pass wait=True so an in-flight transmission finishes before
+        the device is closed.
+        """
+        self._stop.set()
+        if wait:
+            self._idle.wait(timeout=0.5)
+
+    def _send_loop(self, code_name: str, stop: threading.Event):
+        """Send one code: tap once, then repeat while held (sender thread)."""
+        packets = self._get_packets(code_name)
+        if packets is None:
+            self._set_status(f"Error loading: {code_name}")
             return
 
-        freq = codes['freq']
-        tap_code = codes['tap']
-        full_code = codes['full']
+        tap_packet, full_packet = packets
+
+        # Refresh and close set stop (and wait for the sender) before
+        # swapping self.ir out, so one reference serves the whole send
+        ir = self.ir
+        if ir is None or stop.is_set():
+            return
 
         # Send tap code immediately
-        with self.send_lock:
-            if not self.sending:
-                return
-            try:
-                if self.ir:
-                    self.ir.send_ir(tap_code, freq)
-            except Exception as e:
-                self.status_var.set(f"Error: {e}")
-                self.ir = None
-                return
+        try:
+            ir.send_raw(tap_packet)
+        except Exception as e:
+            self._send_failed(ir, stop, e)
+            return
 
-        # Small delay to detect hold
-        time.sleep(0.15)
+        # Small delay to detect hold; a release during it ends the send
+        if stop.wait(0.15):
+            return
 
-        # If still holding, send full code repeatedly
-        while self.sending:
-            with self.send_lock:
-                if not self.sending:
-                    break
-                try:
-                    if self.ir:
-                        self.ir.send_ir(full_code, freq)
-                except Exception as e:
-                    self.status_var.set(f"Error: {e}")
-                    self.ir = None
-                    break
-            time.sleep(0.08)  # ~12 codes per second
+        # If still holding, send full code repeatedly at ~12 codes per
+        # second, paced against a deadline so slow sends do not lower the rate
+        next_send = time.monotonic()
+        while True:
+            try:
+                ir.send_raw(full_packet)
+            except Exception as e:
+                self._send_failed(ir, stop, e)
+                break
+            next_send += 0.08
+            delay = next_send - time.monotonic()
+            if delay < -0.08:
+                # Too far behind (e.g. a stalled transfer): resync instead
+                # of bursting to catch up
+                next_send -= delay
+                delay = 0.0
+            if stop.wait(max(0.0, delay)):
+                break
+
+    def _send_failed(self, ir: TiqiaaIR, stop: threading.Event, error: Exception):
+        """Drop a device that failed mid-send (sender thread)."""
+        # A send cancelled by Refresh or close fails because the device was
+        # closed under it; that is expected and must not clear a new device
+        if stop.is_set():
+            return
+        self._set_status(f"Error: {error}")
+        if self.ir is ir:
+            self.ir = None
 
     def _learn_code(self):
         """Open dialog to learn a new IR code."""
@@ -251,27 +371,58 @@ class IRRemoteGUI:
             )
             return
 
+        # Only one learn at a time
+        self._cancel_learn()
+
         # Show learning dialog
         self.status_var.set(f"Learning '{name}' - Press remote button...")
 
-        def learn():
-            try:
-                ir_data = self.ir.receive_ir(timeout_sec=15, verbose=False)
-                if ir_data:
-                    save_ir_code(name, ir_data)
-                    self.status_var.set(f"Learned and saved: {name}")
-                    # Refresh buttons on main thread
-                    self.root.after(0, self._load_buttons)
-                else:
-                    self.status_var.set("Learning failed - timeout")
-            except Exception as e:
-                self.status_var.set(f"Learning error: {e}")
+        cancel = threading.Event()
+        self._learn_cancel = cancel
+
+        def done(future):
+            # Runs on the pool thread; hand the result to the Tk thread
+            self._post(self._learn_finished, name, cancel, future)
 
-        threading.Thread(target=learn, daemon=True).start()
+        self._learn_future = self._io_pool.submit(self._do_learn, self.ir, name, cancel)
+        self._learn_future.add_done_callback(done)
+
+    def _do_learn(self, ir: TiqiaaIR, name: str, cancel: threading.Event):
+        """Wait for an IR signal and save it (I/O pool thread)."""
+        ir_data = ir.receive_ir(timeout_sec=15, verbose=False, cancel=cancel)
+        if ir_data:
+            save_ir_code(name, ir_data)
+        return ir_data
+
+    def _learn_finished(self, name: str, cancel: threading.Event, future):
+        """Report the outcome of a learn (Tk thread)."""
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is None and future.result():
+            self._invalidate_codes()
+            self._encoded_cache.pop(name, None)
+            self.status_var.set(f"Learned and saved: {name}")
+            self._load_codes()
+        elif cancel.is_set():
+            # Cancelled by Refresh or close, which report their own status
+            return
+        elif error is not None:
+            self.status_var.set(f"Learning error: {error}")
+        else:
+            self.status_var.set("Learning failed - timeout")
+
+    def _cancel_learn(self):
+        """Stop a learn in progress, if any."""
+        self._learn_cancel.set()
+        if self._learn_future is not None:
+            self._learn_future.cancel()
+            self._learn_future = None
 
     def _delete_code(self):
         """Open dialog to delete an IR code."""
-        codes = list_ir_codes()
+        codes = self._cached_list_codes()
         if not codes:
             messagebox.showinfo("Delete Code", "No codes to delete.")
             return
@@ -297,41 +448,53 @@ class IRRemoteGUI:
             f"Delete IR code '{name}'?"
         ):
             if delete_ir_code(name):
+                self._invalidate_codes()
+                self._encoded_cache.pop(name, None)
                 self.status_var.set(f"Deleted: {name}")
-                self._load_buttons()
+                self._load_codes()
             else:
                 messagebox.showerror("Error", f"Failed to delete '{name}'")
 
     def _refresh(self):
-        """Refresh buttons and reconnect device."""
-        self._load_buttons()
-
-        # Stop any ongoing sends
-        self.sending = False
-        if self.send_thread and self.send_thread.is_alive():
-            self.send_thread.join(timeout=0.2)
+        """Refresh code list and reconnect device."""
+        # Pick up codes added, changed or removed outside the GUI
+        self._invalidate_codes()
+        self._encoded_cache.clear()
+        self._load_codes()
+
+        # Stop any ongoing send or learn, then detach the device before
+        # closing it
+        self._cancel_send(wait=True)
+        self._cancel_learn()
+        ir, self.ir = self.ir, None
 
         # Reconnect device
-        with self.send_lock:
-            if self.ir:
-                try:
-                    self.ir.close()
-                except:
-                    pass
-                self.ir = None
+        status = "Reconnecting..."
+        if ir:
+            try:
+                ir.close()
+            except OSError as e:  # includes usb.core.USBError
+                status = f"Close error: {e!r} - Reconnecting..."
 
-        self.status_var.set("Reconnecting...")
+        self.status_var.set(status)
         self._connect_device()
 
     def run(self):
         """Run the application."""
         def on_close():
-            self.sending = False
-            if self.send_thread and self.send_thread.is_alive():
-                self.send_thread.join(timeout=0.2)
-            with self.send_lock:
-                if self.ir:
-                    self.ir.close()
+            # Stop background threads from scheduling Tk callbacks
+            self._closing = True
+            self._cancel_send(wait=True)
+            self._cancel_learn()
+            self._cmd_q.put(None)
+            self._sender.join(timeout=0.2)
+            self._io_pool.shutdown(wait=False)
+            ir, self.ir = self.ir, None
+            if ir:
+                try:
+                    ir.close()
+                except OSError:
+                    pass  # Closing anyway; the window must still go away
             self.root.destroy()
 
         self.root.protocol("WM_DELETE_WINDOW", on_close)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Generate the precomputed NEC encoding table.
+
+Writes tiqiaa/_nec_table.bin containing encode_nec() output for every
+16-bit code as fixed-width entries. When the file is present,
+tiqiaa.nec maps it at import time and encode_nec becomes a slice.
+
+Usage:
+    python tools/gen_nec_table.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tiqiaa import nec
+from tiqiaa.nec import NEC_TABLE_PATH, NEC_TABLE_CODES, _encode_nec_computed
+
+
+def main():
+    # Importing tiqiaa.nec maps any existing table; release it before
+    # replacing the file (Windows refuses to touch a mapped file)
+    if nec._NEC_TABLE is not None:
+        nec._NEC_TABLE.close()
+        nec._NEC_TABLE, nec._NEC_ENTRY_SIZE = None, 0
+
+    frames = [_encode_nec_computed(code) for code in range(NEC_TABLE_CODES)]
+
+    # NEC frames have a fixed layout, so every entry has the same length
+    entry_size = len(frames[0])
+    if any(len(frame) != entry_size for frame in frames):
+        print("Error: NEC frames are not fixed-width, cannot build table")
+        return 1
+
+    # Write beside the table and swap it in, so processes that still map
+    # the old file keep a valid copy instead of seeing it truncated
+    tmp_path = NEC_TABLE_PATH + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(b''.join(frames))
+        os.replace(tmp_path, NEC_TABLE_PATH)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    print(f"Wrote {NEC_TABLE_CODES} codes x {entry_size} bytes to {NEC_TABLE_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())